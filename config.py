@@ -16,6 +16,11 @@ MIN_OI = 100
 IV_LOW_THRESHOLD = 0.20
 IV_HIGH_THRESHOLD = 0.80
 
+# Output Settings
+# Chart HTML is mostly JSON numerics and compresses 5-10x; gzipped files
+# can be served as-is with Content-Encoding: gzip.
+COMPRESS_CHARTS = os.getenv("COMPRESS_CHARTS", "1") != "0"
+
 # Output Paths
 OUTPUT_DIR = "outputs"
 REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
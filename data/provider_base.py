@@ -1,26 +1,72 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict
+
+import polars as pl
+
+# Fixed schema for the standard contract columns every provider emits.
+# Providers return column-oriented data ({column: list}) matching this, so
+# pl.DataFrame can build Arrow buffers directly without per-row schema
+# inference.
+CONTRACT_SCHEMA = {
+    "symbol": pl.Utf8,
+    "underlying": pl.Utf8,
+    "strike": pl.Float64,
+    "expiry": pl.Utf8,
+    "type": pl.Utf8,
+    "bid": pl.Float64,
+    "bid_price": pl.Float64,
+    "ask_price": pl.Float64,
+    "last_price": pl.Float64,
+    "volume": pl.Int64,
+    "open_interest": pl.Int64,
+    "implied_volatility": pl.Float64,
+    "delta": pl.Float64,
+    "gamma": pl.Float64,
+    "theta": pl.Float64,
+    "vega": pl.Float64,
+}
+
+STANDARD_COLUMNS = list(CONTRACT_SCHEMA)
+
+def merge_columns(parts: List[Dict[str, list]]) -> Dict[str, list]:
+    """
+    Merge column-oriented chain fragments (e.g. one per expiration or per
+    snapshot page) into a single {column: list} mapping. Returns {} when
+    there is no data, so callers can keep truthiness checks.
+    """
+    merged = {name: [] for name in STANDARD_COLUMNS}
+    for part in parts:
+        if not part:
+            continue
+        for name in STANDARD_COLUMNS:
+            merged[name].extend(part.get(name, []))
+    return merged if merged["symbol"] else {}
 
 class DataProvider(ABC):
     """
     Abstract base class for data providers.
     """
-    
+
+    async def __aenter__(self):
+        """
+        Providers can be used as async context managers. Implementations
+        that hold network resources (sessions, pools) override this pair
+        to manage their lifetime; the default is a no-op.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
     @abstractmethod
-    async def get_option_chain(self, symbol: str) -> List[Dict[str, Any]]:
+    async def get_option_chain(self, symbol: str) -> Dict[str, list]:
         """
         Fetch the full option chain for a given symbol.
-        Should return a list of dictionaries with standard keys:
-        - symbol
-        - strike
-        - expiry
-        - type (call/put)
-        - bid
-        - ask
-        - last
-        - volume
-        - open_interest
-        - implied_volatility (if available from source)
+        Should return column-oriented data: a mapping of column name to a
+        list of values, with the columns of CONTRACT_SCHEMA (symbol,
+        strike, expiry, type, bid/ask/last prices, volume, open_interest,
+        implied_volatility and Greeks where available). Return {} when no
+        data is found.
         """
         pass
     
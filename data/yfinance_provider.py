@@ -1,12 +1,14 @@
 import yfinance as yf
 import asyncio
+import concurrent.futures
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import List, Dict, Any
-from .provider_base import DataProvider
+from typing import Dict
+from .provider_base import DataProvider, STANDARD_COLUMNS, merge_columns
 from config import RISK_FREE_RATE
 from models.black_scholes import calculate_greeks
+from utils.cache import async_ttl_cache
 from utils.logger import logger
 
 class YFinanceProvider(DataProvider):
@@ -16,11 +18,20 @@ class YFinanceProvider(DataProvider):
     """
     
     def __init__(self):
-        pass
+        # Dedicated pool for yfinance's blocking calls: the default
+        # asyncio.to_thread executor is shared process-wide and caps at
+        # min(32, cpu+4), so fanning out multiple tickers from main.py can
+        # starve it. The semaphore bounds in-flight Yahoo requests to stay
+        # under their rate limit.
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=16)
+        self._sem = asyncio.Semaphore(8)
 
+    @async_ttl_cache(30)
     async def get_stock_price(self, symbol: str) -> float:
         """
         Fetch current spot price for the underlying symbol using yfinance.
+        Cached for 30s — get_option_chain needs the spot too, so this saves
+        a duplicate Yahoo round-trip per ticker.
         """
         try:
             # Run blocking yfinance call in a separate thread
@@ -43,81 +54,77 @@ class YFinanceProvider(DataProvider):
             logger.error(f"Error fetching stock price for {symbol}: {e}")
             return 0.0
 
-    async def get_option_chain(self, symbol: str) -> List[Dict[str, Any]]:
+    @async_ttl_cache(60)
+    async def get_option_chain(self, symbol: str) -> Dict[str, list]:
         """
         Fetch the full option chain for a given symbol and calculate Greeks.
+        Returns column-oriented data ({column: list}) per CONTRACT_SCHEMA.
+        Cached for 60s so repeated scans of the same ticker reuse the chain.
         """
         try:
             ticker = yf.Ticker(symbol)
-            
+
             # Get current price for Greek calculations
             spot_price = await self.get_stock_price(symbol)
             if spot_price == 0:
-                return []
-                
+                return {}
+
             # Get available expirations
             expirations = await asyncio.to_thread(lambda: ticker.options)
-            
+
             if not expirations:
                 logger.warning(f"No options found for {symbol}")
-                return []
-                
-            all_options = []
-            
-            # We will fetch all expirations. 
+                return {}
+
+            # We will fetch all expirations.
             # Warning: This can be slow for tickers with many expirations (like SPY).
             # For a real scanner, we might want to limit to the next 4-6 weeks.
             # For now, let's fetch all but be mindful it might take time.
-            
-            # Use asyncio.gather to fetch expirations in parallel threads?
-            # yfinance might have internal rate limiting or locking, but let's try batching.
-            
+
             # Creating tasks for each expiration
             tasks = [self._fetch_chain_for_date(ticker, date, spot_price) for date in expirations]
             results = await asyncio.gather(*tasks)
-            
-            for res in results:
-                all_options.extend(res)
-                
-            return all_options
-            
+
+            return merge_columns(results)
+
         except Exception as e:
             logger.error(f"Error fetching option chain for {symbol}: {e}")
-            return []
+            return {}
 
-    async def _fetch_chain_for_date(self, ticker, date: str, spot_price: float) -> List[Dict[str, Any]]:
+    async def _fetch_chain_for_date(self, ticker, date: str, spot_price: float) -> Dict[str, list]:
         """
         Helper to fetch and process a single expiration date.
         """
         try:
-            # Run blocking call
-            chain = await asyncio.to_thread(lambda: ticker.option_chain(date))
-            
+            # Run blocking call on our bounded pool
+            async with self._sem:
+                chain = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, ticker.option_chain, date
+                )
+
             calls = chain.calls
             puts = chain.puts
-            
-            results = []
-            
+
+            parts = []
+
             # Process Calls
             if not calls.empty:
-                results.extend(self._process_dataframe(calls, date, "call", spot_price, ticker.ticker))
-                
+                parts.append(self._process_dataframe(calls, date, "call", spot_price, ticker.ticker))
+
             # Process Puts
             if not puts.empty:
-                results.extend(self._process_dataframe(puts, date, "put", spot_price, ticker.ticker))
-                
-            return results
-            
+                parts.append(self._process_dataframe(puts, date, "put", spot_price, ticker.ticker))
+
+            return merge_columns(parts)
+
         except Exception as e:
             logger.error(f"Error fetching options for {ticker.ticker} on {date}: {e}")
-            return []
+            return {}
 
-    def _process_dataframe(self, df: pd.DataFrame, expiry: str, option_type: str, S: float, symbol: str) -> List[Dict[str, Any]]:
+    def _process_dataframe(self, df: pd.DataFrame, expiry: str, option_type: str, S: float, symbol: str) -> Dict[str, list]:
         """
         Process yfinance DataFrame to standard format and calculate Greeks.
         """
-        results = []
-        
         # Calculate Time to Expiry (T)
         try:
             expiry_date = datetime.strptime(expiry, "%Y-%m-%d").date()
@@ -131,38 +138,35 @@ class YFinanceProvider(DataProvider):
             T = 0.1 # Fallback
             
         r = RISK_FREE_RATE
-        
-        for _, row in df.iterrows():
-            K = float(row["strike"])
-            sigma = float(row["impliedVolatility"])
-            
-            # Calculate Greeks
-            # Note: yfinance IV is sometimes 0 or crazy if illiquid.
-            greeks = {
-                'delta': None, 'gamma': None, 'theta': None, 'vega': None, 'rho': None
-            }
-            
-            if sigma > 0 and T > 0:
-                greeks = calculate_greeks(S, K, T, r, sigma, option_type)
-            
-            item = {
-                "symbol": row["contractSymbol"],
-                "underlying": symbol,
-                "strike": K,
-                "expiry": expiry,
-                "type": option_type,
-                "bid": row["bid"], # yfinance labels
-                "bid_price": row["bid"],
-                "ask_price": row["ask"],
-                "last_price": row["lastPrice"],
-                "volume": int(row["volume"]) if not pd.isna(row["volume"]) else 0,
-                "open_interest": int(row["openInterest"]) if not pd.isna(row["openInterest"]) else 0,
-                "implied_volatility": sigma,
-                "delta": greeks['delta'],
-                "gamma": greeks['gamma'],
-                "theta": greeks['theta'],
-                "vega": greeks['vega']
-            }
-            results.append(item)
-            
-        return results
+
+        # Vectorized Greeks: one call over the whole frame instead of one
+        # scipy.norm evaluation per row.
+        K = df["strike"].to_numpy(dtype=float)
+        sigma = df["impliedVolatility"].to_numpy(dtype=float)
+        is_call = np.full(len(df), option_type == "call")
+
+        greeks = calculate_greeks(S, K, T, r, sigma, is_call)
+
+        # Note: yfinance IV is sometimes 0 or crazy if illiquid — mask those out.
+        valid = (sigma > 0) & (T > 0)
+
+        # Columnar build: rename/assign whole columns, then dump column lists.
+        # No per-row Python work (iterrows boxes every cell into a Series).
+        df = df.rename(columns={
+            "contractSymbol": "symbol",
+            "lastPrice": "last_price",
+            "openInterest": "open_interest",
+            "impliedVolatility": "implied_volatility"
+        })
+        df["underlying"] = symbol
+        df["expiry"] = expiry
+        df["type"] = option_type
+        df["bid_price"] = df["bid"]  # yfinance labels
+        df["ask_price"] = df["ask"]
+        df[["volume", "open_interest"]] = df[["volume", "open_interest"]].fillna(0).astype("int64")
+        df["delta"] = np.where(valid, greeks['delta'], np.nan)
+        df["gamma"] = np.where(valid, greeks['gamma'], np.nan)
+        df["theta"] = np.where(valid, greeks['theta'], np.nan)
+        df["vega"] = np.where(valid, greeks['vega'], np.nan)
+
+        return df[STANDARD_COLUMNS].to_dict(orient="list")
@@ -1,5 +1,6 @@
 import asyncio
 import argparse
+import contextlib
 import polars as pl
 import os
 from datetime import datetime
@@ -7,13 +8,14 @@ from datetime import datetime
 from config import DATA_PROVIDER, REPORTS_DIR, CHARTS_DIR
 from utils.logger import logger
 from data.polygon_provider import PolygonProvider
+from data.provider_base import CONTRACT_SCHEMA
 from data.yfinance_provider import YFinanceProvider
 from scanners.iv_scanner import scan_iv
 from scanners.uoa_scanner import scan_uoa
 from scanners.delta_scanner import scan_delta
 from scanners.mispricing_scanner import scan_mispricing, calculate_theoretical_price
 from scanners.spread_scanner import scan_spreads
-from utils.visualization import plot_iv_smile, plot_delta_heatmap, plot_volume_oi
+from utils.visualization import plot_all
 
 async def process_ticker(ticker: str, provider):
     logger.info(f"Fetching data for {ticker}...")
@@ -32,35 +34,41 @@ async def process_ticker(ticker: str, provider):
         logger.warning(f"No options data for {ticker}.")
         return
 
-    # Convert to Polars DataFrame
-    df = pl.DataFrame(chain)
-    
+    # Convert to Polars DataFrame. Providers return column-oriented data
+    # matching CONTRACT_SCHEMA, so this builds Arrow buffers directly with
+    # no per-row schema inference.
+    df = pl.DataFrame(chain, schema=CONTRACT_SCHEMA)
+
     # Ensure numeric columns
     numeric_cols = ["strike", "bid_price", "ask_price", "last_price", "volume", "open_interest", "implied_volatility", "delta", "gamma", "theta", "vega"]
-    for col in numeric_cols:
-        df = df.with_columns(pl.col(col).cast(pl.Float64).fill_null(0.0))
-        
+    # Single with_columns pass: casting column-by-column rebuilds the frame
+    # once per column (11 plans); one expression list is one plan.
+    df = df.with_columns([pl.col(c).cast(pl.Float64).fill_null(0.0) for c in numeric_cols])
+
+    # Int8 side-channel for the contract type (0=call, 1=put): scanners mask
+    # on this instead of comparing strings element by element. The string
+    # column stays as-is for reports and charts.
+    df = df.with_columns((pl.col("type") == "put").cast(pl.Int8).alias("type_code"))
+
     logger.info(f"Processing {len(df)} contracts for {ticker}...")
 
     # --- 1. Calculate Theoretical Prices & Mispricing ---
-    df = calculate_theoretical_price(df, price)
-    
+    today = datetime.now().date()
+    df = calculate_theoretical_price(df, price, today)
+
     # --- 2. Run Scanners ---
-    
-    # IV Scanner
-    iv_signals = scan_iv(df)
-    
-    # UOA Scanner
-    uoa_signals = scan_uoa(df)
-    
-    # Spread Scanner
-    spread_signals = scan_spreads(df)
-    
-    # Delta Buckets
-    df = scan_delta(df) # Adds bucket column
-    
-    # Mispricing Scanner (already computed signals in calculate_theoretical_price, but let's filter)
-    mispricing_signals = scan_mispricing(df)
+
+    # All scanners are lazy plans over the same root frame; collect_all runs
+    # them in parallel and lets Polars fuse shared filters/projections.
+    lf = df.lazy()
+
+    iv_signals, uoa_signals, spread_signals, df, mispricing_signals = pl.collect_all([
+        scan_iv(lf),           # IV Scanner
+        scan_uoa(lf),          # UOA Scanner
+        scan_spreads(lf),      # Spread Scanner
+        scan_delta(lf),        # Delta Buckets (adds bucket column to the full frame)
+        scan_mispricing(lf),   # Mispricing (signals computed in calculate_theoretical_price)
+    ])
     
     # Combine Signals
     # We want a master report of "Interesting" options
@@ -95,53 +103,86 @@ async def process_ticker(ticker: str, provider):
     if not mispricing_signals.is_empty():
         all_signals.append(mispricing_signals.rename({"mispricing_signal": "signal"}).select(["symbol", "strike", "expiry", "type", "signal"]))
         
+    report_df = None
     if all_signals:
-        report_df = pl.concat(all_signals)
-        
-        # Save Report
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = os.path.join(REPORTS_DIR, f"{ticker}_signals_{timestamp}.csv")
-        report_df.write_csv(report_path)
-        logger.info(f"Saved signals report to {report_path}")
-        
+        # Buffer the report instead of writing one file per ticker — main()
+        # concatenates all tickers and writes a single report per run, so
+        # disk I/O isn't serialized inside the per-ticker fan-out.
+        report_df = pl.concat(all_signals).with_columns(pl.lit(ticker).alias("ticker"))
+
         # Print Top Opportunities
         print(f"\n--- TOP SIGNALS FOR {ticker} ---")
         print(report_df.head(10))
-        
+
     else:
         logger.info(f"No significant signals found for {ticker}.")
-        
+
     # Save Full Chain with Greeks (Optional, maybe too big)
     # df.write_csv(os.path.join(REPORTS_DIR, f"{ticker}_full_chain.csv"))
 
-    # --- 3. Visualizations ---
-    logger.info("Generating charts...")
-    plot_iv_smile(df, ticker)
-    plot_delta_heatmap(df, ticker)
-    plot_volume_oi(df, ticker)
-    logger.info("Charts generated.")
+    # Charts are rendered in batch by main() (plot_all fans out across a
+    # process pool), so hand the enriched chain back alongside the report.
+    return report_df, df
 
 async def main():
     parser = argparse.ArgumentParser(description="Option Scanner")
     parser.add_argument("tickers", nargs="+", help="List of tickers to scan (e.g. SPY QQQ AAPL)")
+    parser.add_argument("--csv", action="store_true", help="Write the signals report as CSV instead of Parquet")
     args = parser.parse_args()
     
     # Create output directories if not exist
     os.makedirs(REPORTS_DIR, exist_ok=True)
     os.makedirs(CHARTS_DIR, exist_ok=True)
     
-    # Initialize Provider
-    if DATA_PROVIDER.lower() == "polygon":
-        provider = PolygonProvider()
-    elif DATA_PROVIDER.lower() == "yfinance":
-        provider = YFinanceProvider()
+    # Initialize Provider. The HTTP session is created here, once per
+    # application, and injected — N concurrent process_ticker calls then
+    # share one connector/DNS cache instead of each building their own.
+    async with contextlib.AsyncExitStack() as stack:
+        if DATA_PROVIDER.lower() == "polygon":
+            session = await stack.enter_async_context(PolygonProvider.create_session())
+            provider = PolygonProvider(session=session)
+        elif DATA_PROVIDER.lower() == "yfinance":
+            provider = YFinanceProvider()
+        else:
+            logger.error(f"Unknown provider: {DATA_PROVIDER}")
+            return
+
+        await stack.enter_async_context(provider)
+
+        tasks = [process_ticker(ticker, provider) for ticker in args.tickers]
+        results = await asyncio.gather(*tasks)
+
+    frames = []
+    chart_dfs = {}
+    for ticker, result in zip(args.tickers, results):
+        if result is None:
+            continue
+        report_df, chain_df = result
+        if report_df is not None:
+            frames.append(report_df)
+        chart_dfs[ticker] = chain_df
+
+    # One combined signals report per run. Parquet (zstd) by default: it's
+    # written straight from the Arrow buffers with no float-to-text
+    # formatting and comes out 5-10x smaller than CSV.
+    if frames:
+        report = pl.concat(frames)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if args.csv:
+            report_path = os.path.join(REPORTS_DIR, f"signals_{timestamp}.csv")
+            report.write_csv(report_path)
+        else:
+            report_path = os.path.join(REPORTS_DIR, f"signals_{timestamp}.parquet")
+            report.write_parquet(report_path, compression="zstd", compression_level=3)
+        logger.info(f"Saved signals report to {report_path}")
     else:
-        logger.error(f"Unknown provider: {DATA_PROVIDER}")
-        return
+        logger.info("No signals found across the scanned tickers.")
 
-    # Process tickers
-    tasks = [process_ticker(ticker, provider) for ticker in args.tickers]
-    await asyncio.gather(*tasks)
+    # Batch chart generation across a process pool
+    if chart_dfs:
+        logger.info("Generating charts...")
+        plot_all(chart_dfs)
+        logger.info("Charts generated.")
 
 if __name__ == "__main__":
     asyncio.run(main())
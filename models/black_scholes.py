@@ -4,7 +4,7 @@ from scipy.stats import norm
 N = norm.cdf
 n = norm.pdf
 
-def d1_d2(S, K, T, r, sigma):
+def d1_d2(S, K, T, r, sigma, sqrt_T=None, log_SK=None):
     """
     Calculate d1 and d2 parameters for Black-Scholes.
     S: Spot price
@@ -12,54 +12,79 @@ def d1_d2(S, K, T, r, sigma):
     T: Time to expiration (in years)
     r: Risk-free interest rate
     sigma: Implied volatility
+    sqrt_T / log_SK: optional precomputed sqrt(T) and log(S/K) — callers
+    that re-evaluate at many sigmas (e.g. the IV Newton loop) compute
+    these once instead of paying the transcendentals per call.
     """
     # Avoid division by zero and log of zero
     S = np.maximum(S, 1e-6)
     sigma = np.maximum(sigma, 1e-6)
     T = np.maximum(T, 1e-6)
-    
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
+
+    if sqrt_T is None:
+        sqrt_T = np.sqrt(T)
+    if log_SK is None:
+        log_SK = np.log(S / K)
+
+    d1 = (log_SK + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
     return d1, d2
 
-def bs_price(S, K, T, r, sigma, option_type='call'):
+def bs_price(S, K, T, r, sigma, option_type='call', sqrt_T=None, log_SK=None, disc=None):
     """
     Calculate Black-Scholes option price.
     option_type: 'call' or 'put'
+    sqrt_T / log_SK / disc: optional precomputed sqrt(T), log(S/K) and
+    exp(-r*T), shareable across repeated calls with the same T.
     """
-    d1, d2 = d1_d2(S, K, T, r, sigma)
-    
+    d1, d2 = d1_d2(S, K, T, r, sigma, sqrt_T=sqrt_T, log_SK=log_SK)
+
+    if disc is None:
+        disc = np.exp(-r * T)
+
     if option_type == 'call':
-        price = S * N(d1) - K * np.exp(-r * T) * N(d2)
+        price = S * N(d1) - K * disc * N(d2)
     else:
-        price = K * np.exp(-r * T) * N(-d2) - S * N(-d1)
-        
+        price = K * disc * N(-d2) - S * N(-d1)
+
     return price
 
 def calculate_greeks(S, K, T, r, sigma, option_type='call'):
     """
-    Calculate all greeks.
+    Calculate all greeks. Fully vectorized: S, K, T, sigma may be scalars
+    or NumPy arrays, and option_type may be 'call'/'put' or a boolean
+    array (True=call) for mixed chains.
     Returns dictionary with delta, gamma, theta, vega, rho.
     """
-    d1, d2 = d1_d2(S, K, T, r, sigma)
-    
-    # Gamma (same for call and put)
-    gamma = n(d1) / (S * sigma * np.sqrt(T))
-    
-    # Vega (same for call and put, usually divided by 100)
-    vega = S * np.sqrt(T) * n(d1) / 100.0
-    
-    if option_type == 'call':
-        delta = N(d1)
-        theta = (- (S * n(d1) * sigma) / (2 * np.sqrt(T)) 
-                 - r * K * np.exp(-r * T) * N(d2)) / 365.0
-        rho = K * T * np.exp(-r * T) * N(d2) / 100.0
+    if isinstance(option_type, str):
+        is_call = option_type == 'call'
     else:
-        delta = N(d1) - 1
-        theta = (- (S * n(d1) * sigma) / (2 * np.sqrt(T)) 
-                 + r * K * np.exp(-r * T) * N(-d2)) / 365.0
-        rho = -K * T * np.exp(-r * T) * N(-d2) / 100.0
-        
+        is_call = np.asarray(option_type, dtype=bool)
+
+    sqrt_T = np.sqrt(np.maximum(T, 1e-6))
+    d1, d2 = d1_d2(S, K, T, r, sigma, sqrt_T=sqrt_T)
+
+    # Gamma (same for call and put). Clamp the denominator like d1_d2 does:
+    # chains routinely carry sigma=0 rows (illiquid strikes) that callers
+    # mask to NaN afterwards, and dividing by the raw values would spray
+    # RuntimeWarnings on every run.
+    gamma = n(d1) / (np.maximum(S, 1e-6) * np.maximum(sigma, 1e-6) * sqrt_T)
+
+    # Vega (same for call and put, usually divided by 100)
+    vega = S * sqrt_T * n(d1) / 100.0
+
+    # Shared terms between the call and put branches
+    disc = np.exp(-r * T)
+    decay = - (S * n(d1) * sigma) / (2 * sqrt_T)
+
+    delta = np.where(is_call, N(d1), N(d1) - 1)
+    theta = np.where(is_call,
+                     (decay - r * K * disc * N(d2)) / 365.0,
+                     (decay + r * K * disc * N(-d2)) / 365.0)
+    rho = np.where(is_call,
+                   K * T * disc * N(d2) / 100.0,
+                   -K * T * disc * N(-d2) / 100.0)
+
     return {
         'delta': delta,
         'gamma': gamma,
@@ -71,25 +96,54 @@ def calculate_greeks(S, K, T, r, sigma, option_type='call'):
 def implied_volatility(price, S, K, T, r, option_type='call', tol=1e-5, max_iter=100):
     """
     Calculate Implied Volatility using Newton-Raphson method.
+    Vectorized: price, S, K, T may be scalars or same-length arrays, so a
+    whole chain is solved in max_iter array passes instead of N scalar
+    Newton loops. Scalar inputs return a float as before.
     """
-    sigma = 0.5  # Initial guess
-    
+    scalar_input = np.ndim(price) == 0
+
+    price, S, K, T = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(price, dtype=float)),
+        np.asarray(S, dtype=float),
+        np.asarray(K, dtype=float),
+        np.asarray(T, dtype=float)
+    )
+
+    sigma = np.full(price.shape, 0.5)  # Initial guess
+    converged = np.zeros(price.shape, dtype=bool)
+
+    # sqrt(T), exp(-rT) and log(S/K) are invariant across Newton iterations
+    # — hoist them out of the loop instead of recomputing ~3 transcendental
+    # calls per step.
+    sqrt_T = np.sqrt(np.maximum(T, 1e-6))
+    disc = np.exp(-r * T)
+    log_SK = np.log(np.maximum(S, 1e-6) / K)
+
     for i in range(max_iter):
-        P = bs_price(S, K, T, r, sigma, option_type)
-        diff = price - P
-        
-        if abs(diff) < tol:
-            return sigma
-            
-        d1, _ = d1_d2(S, K, T, r, sigma)
-        vega = S * np.sqrt(T) * n(d1)
-        
-        if vega == 0:
+        active = ~converged
+        if not active.any():
             break
-            
-        sigma = sigma + diff / vega
-        
+
+        P = bs_price(S[active], K[active], T[active], r, sigma[active], option_type,
+                     sqrt_T=sqrt_T[active], log_SK=log_SK[active], disc=disc[active])
+        diff = price[active] - P
+
+        newly = np.abs(diff) < tol
+        converged[active] |= newly
+
+        d1, _ = d1_d2(S[active], K[active], T[active], r, sigma[active],
+                      sqrt_T=sqrt_T[active], log_SK=log_SK[active])
+        vega = S[active] * sqrt_T[active] * n(d1)
+
+        # Zero vega: Newton can't make progress for those elements
+        dead = vega == 0
+        converged[active] |= dead
+
+        step = np.where(newly | dead, 0.0, diff / np.where(dead, 1.0, vega))
+
         # Clamp sigma to reasonable bounds
-        sigma = max(1e-4, min(sigma, 5.0))
-        
+        sigma[active] = np.clip(sigma[active] + step, 1e-4, 5.0)
+
+    if scalar_input:
+        return float(sigma[0])
     return sigma
@@ -0,0 +1,47 @@
+"""
+Numba-compiled Black-Scholes kernel for the hot mispricing path.
+
+SciPy's norm.cdf goes through a Python-level wrapper around
+scipy.special.ndtr per call; for full-chain scans the pricing step is
+compute-bound. This kernel inlines an erf-based normal CDF and lets LLVM
+vectorize/parallelize the loop. Numba is optional: callers should fall
+back to models.black_scholes.bs_price when `bs_price_nb` is None.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+def _bs_price_kernel(S, K, T, r, sigma, is_call):
+    out = np.empty(len(S))
+    for i in prange(len(S)):
+        # Same guards as d1_d2 in black_scholes.py
+        s = max(S[i], 1e-6)
+        sig = max(sigma[i], 1e-6)
+        t = max(T[i], 1e-6)
+
+        sqrt_t = math.sqrt(t)
+        d1 = (math.log(s / K[i]) + (r + 0.5 * sig * sig) * t) / (sig * sqrt_t)
+        d2 = d1 - sig * sqrt_t
+        disc = math.exp(-r * t)
+
+        nd1 = 0.5 * (1.0 + math.erf(d1 * _INV_SQRT2))
+        nd2 = 0.5 * (1.0 + math.erf(d2 * _INV_SQRT2))
+
+        if is_call[i]:
+            out[i] = s * nd1 - K[i] * disc * nd2
+        else:
+            out[i] = K[i] * disc * (1.0 - nd2) - s * (1.0 - nd1)
+    return out
+
+if njit is not None:
+    bs_price_nb = njit(cache=True, parallel=True, fastmath=True)(_bs_price_kernel)
+else:
+    bs_price_nb = None
@@ -1,31 +1,22 @@
 import polars as pl
 
-def scan_delta(df: pl.DataFrame) -> pl.DataFrame:
+def scan_delta(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Categorize options by delta buckets.
+    Returns the whole frame with a delta_bucket column for filtering later.
+    Lazy: collected by the caller alongside the other scanners.
     """
     # Absolute delta for categorization (handling puts)
     df = df.with_columns(pl.col("delta").abs().alias("abs_delta"))
-    
-    # Define buckets
-    # We return the whole dataframe with an extra column for filtering later
-    # or we can just return specific interesting ones.
-    
-    # Let's just mark them.
-    
-    def get_bucket(delta):
-        if delta >= 0.70: return "DEEP_ITM"
-        elif delta >= 0.45: return "DIRECTIONAL"
-        elif delta >= 0.25: return "SENSIBLE"
-        elif delta >= 0.10: return "LOTTO"
-        else: return "OTM_JUNK"
 
-    # Polars optimization using expressions
+    # Single-pass bucketing: cut does a vectorized binary search over the
+    # sorted break points instead of evaluating a chain of when/then
+    # branches per row. left_closed keeps the >= boundary semantics.
     return df.with_columns(
-        pl.when(pl.col("abs_delta") >= 0.70).then(pl.lit("DEEP_ITM"))
-        .when(pl.col("abs_delta") >= 0.45).then(pl.lit("DIRECTIONAL"))
-        .when(pl.col("abs_delta") >= 0.25).then(pl.lit("SENSIBLE"))
-        .when(pl.col("abs_delta") >= 0.10).then(pl.lit("LOTTO"))
-        .otherwise(pl.lit("OTM_JUNK"))
+        pl.col("abs_delta")
+        .cut(breaks=[0.10, 0.25, 0.45, 0.70],
+             labels=["OTM_JUNK", "LOTTO", "SENSIBLE", "DIRECTIONAL", "DEEP_ITM"],
+             left_closed=True)
+        .cast(pl.Utf8)
         .alias("delta_bucket")
     )
@@ -1,22 +1,23 @@
 import polars as pl
 from config import IV_LOW_THRESHOLD, IV_HIGH_THRESHOLD
 
-def scan_iv(df: pl.DataFrame) -> pl.DataFrame:
+def scan_iv(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Scan for high and low IV opportunities.
-    df: Polars DataFrame containing option chain data.
+    df: LazyFrame of option chain data; the result is collected by the
+    caller (main.py batches all scanners through pl.collect_all).
     """
-    # Filter for liquid options first
-    df = df.filter(pl.col("volume") > 0)
-    
-    # Low IV -> Buy Candidates
-    low_iv = df.filter(pl.col("implied_volatility") < IV_LOW_THRESHOLD).with_columns(
-        pl.lit("BUY_VOL").alias("signal")
+    # One fused pass: the liquidity check and both IV predicates go in a
+    # single filter, with a when/then labelling the side. The previous
+    # version scanned the frame three times (volume filter, low-IV filter,
+    # high-IV filter) and paid a concat on top.
+    return df.filter(
+        (pl.col("volume") > 0)
+        & ((pl.col("implied_volatility") < IV_LOW_THRESHOLD)
+           | (pl.col("implied_volatility") > IV_HIGH_THRESHOLD))
+    ).with_columns(
+        pl.when(pl.col("implied_volatility") < IV_LOW_THRESHOLD)
+        .then(pl.lit("BUY_VOL"))
+        .otherwise(pl.lit("SELL_VOL"))
+        .alias("signal")
     )
-    
-    # High IV -> Sell Candidates
-    high_iv = df.filter(pl.col("implied_volatility") > IV_HIGH_THRESHOLD).with_columns(
-        pl.lit("SELL_VOL").alias("signal")
-    )
-    
-    return pl.concat([low_iv, high_iv])
@@ -1,75 +1,113 @@
 import polars as pl
 import numpy as np
 from models.black_scholes import bs_price
+from models.bs_numba import bs_price_nb
 from config import RISK_FREE_RATE
 from datetime import datetime, timedelta
 
-def scan_mispricing(df: pl.DataFrame) -> pl.DataFrame:
+def scan_mispricing(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Returns only the rows flagged as mispriced.
     Assumes 'mispricing_signal' column exists (added by calculate_theoretical_price).
+    Lazy: collected by the caller alongside the other scanners.
     """
-    if "mispricing_signal" not in df.columns:
-        return pl.DataFrame(schema=df.schema)
-        
+    if "mispricing_signal" not in df.collect_schema().names():
+        return df.clear()
+
     return df.filter(pl.col("mispricing_signal").is_not_null())
     
-def calculate_theoretical_price(df: pl.DataFrame, underlying_price: float) -> pl.DataFrame:
+def calculate_theoretical_price(df: pl.DataFrame, underlying_price: float, today=None) -> pl.DataFrame:
     """
     Augments DF with theoretical_price and mispricing_signal.
     Returns the FULL DataFrame with new columns.
+    today: optional date, so callers scanning many tickers can evaluate
+    it once per run instead of once per scan.
     """
-    # Add underlying price
-    df = df.with_columns(pl.lit(underlying_price).alias("S"))
-    
-    # Calculate T (years)
-    df = df.with_columns(
-        pl.col("expiry").str.strptime(pl.Date, "%Y-%m-%d").alias("expiry_date")
-    )
-    
-    today = datetime.now().date()
-    
+    if today is None:
+        today = datetime.now().date()
+
+    # S, expiry_date and T in one pass. The expiry parse expression is
+    # shared between expiry_date and T — Polars' CSE evaluates it once.
+    expiry_date = pl.col("expiry").str.to_date("%Y-%m-%d")
     df = df.with_columns(
-        ((pl.col("expiry_date") - pl.lit(today)).dt.total_days() / 365.0).alias("T")
+        pl.lit(underlying_price).alias("S"),
+        expiry_date.alias("expiry_date"),
+        ((expiry_date - pl.lit(today)).dt.total_days() / 365.0).alias("T")
     )
     
     # Filter out expired or T<=0 for calculation safety (masking)
     # We won't remove rows, just handle calc
     
-    # Extract numpy arrays for BS calculation
-    S = df["S"].to_numpy()
-    K = df["strike"].to_numpy()
-    T_vals = df["T"].to_numpy()
-    sigma = df["implied_volatility"].fill_null(0).to_numpy()
+    # Extract numpy arrays for BS calculation. Rechunk first: allow_copy=False
+    # needs a single contiguous Arrow buffer, and concatenated inputs are
+    # legitimately multi-chunk — for the usual single-chunk frame this is a
+    # no-op. strike and the filled sigma are null-free by the time we get
+    # here (main.py casts/fills them), so the views stay zero-copy. T is
+    # NOT guaranteed null-free — a null expiry (Polygon appends
+    # details.expiration_date unvalidated) passes through str.to_date —
+    # so it gets filled with 0 first, which routes the row through
+    # valid_mask to a 0.0 price like the rest of the degenerate inputs.
+    # S is a run-wide scalar, so the broadcast array is built directly
+    # rather than round-tripped through the lit column (which stays in the
+    # frame for the output).
+    df = df.rechunk()
+    S = np.full(len(df), underlying_price)
+    K = df["strike"].to_numpy(allow_copy=False)
+    T_vals = df["T"].fill_null(0.0).to_numpy()
+    sigma = df["implied_volatility"].fill_null(0).to_numpy(allow_copy=False)
     r = RISK_FREE_RATE
-    
-    # Types
-    types = df["type"].to_numpy() # 'call' or 'put'
-    
+
+    # Mask on the Int8 type_code (0=call, 1=put) when main.py has attached
+    # it — a native SIMD-friendly comparison. A null contract_type yields
+    # a null code, filled to 1 so unknowns price as puts rather than
+    # poisoning the export. Fall back to the string column for callers
+    # that pass a raw chain.
+    if "type_code" in df.columns:
+        is_call = df["type_code"].fill_null(1).to_numpy() == 0
+    else:
+        is_call = (df["type"] == "call").to_numpy()
+
     prices = np.zeros(len(df))
-    
+
     # Calculate mask for valid options (T > 0)
     valid_mask = (T_vals > 0.001)
-    
-    # Calls
-    call_mask = (types == 'call') & valid_mask
-    if np.any(call_mask):
-        prices[call_mask] = bs_price(S[call_mask], K[call_mask], T_vals[call_mask], r, sigma[call_mask], 'call')
-        
-    # Puts
-    put_mask = (types == 'put') & valid_mask
-    if np.any(put_mask):
-        prices[put_mask] = bs_price(S[put_mask], K[put_mask], T_vals[put_mask], r, sigma[put_mask], 'put')
+
+    if np.any(valid_mask):
+        v = valid_mask
+        # Dedup before pricing: chains carry many contracts sharing the
+        # same (K, T, sigma) — yfinance rounds IV aggressively — so we
+        # BS-evaluate only the unique input rows and scatter the results
+        # back through the inverse index.
+        stacked = np.column_stack((S[v], K[v], T_vals[v], sigma[v], is_call[v]))
+        uniq, inverse = np.unique(stacked, axis=0, return_inverse=True)
+
+        uS = np.ascontiguousarray(uniq[:, 0])
+        uK = np.ascontiguousarray(uniq[:, 1])
+        uT = np.ascontiguousarray(uniq[:, 2])
+        usigma = np.ascontiguousarray(uniq[:, 3])
+        u_call = uniq[:, 4].astype(bool)
+
+        u_prices = np.zeros(len(uniq))
+        if bs_price_nb is not None:
+            # JIT kernel: one fused pass over the unique rows, both types at once
+            u_prices = bs_price_nb(uS, uK, uT, r, usigma, u_call)
+        else:
+            # SciPy fallback when numba isn't installed
+            if np.any(u_call):
+                u_prices[u_call] = bs_price(uS[u_call], uK[u_call], uT[u_call], r, usigma[u_call], 'call')
+            if np.any(~u_call):
+                u_prices[~u_call] = bs_price(uS[~u_call], uK[~u_call], uT[~u_call], r, usigma[~u_call], 'put')
+
+        prices[v] = u_prices[inverse]
         
-    # Add back to DF
-    df = df.with_columns(pl.Series(name="theoretical_price", values=prices))
-    
-    # Compare
-    df = df.with_columns(
-        ((pl.col("bid_price") + pl.col("ask_price")) / 2).alias("mid_price")
-    )
-    
+    # Add back to DF and compare, fused into as few passes as possible:
+    # one pass injects the priced Series alongside mid_price, one pass
+    # derives the signal. Chaining a with_columns per column rewrites the
+    # frame each time.
     df = df.with_columns(
+        pl.Series(name="theoretical_price", values=prices, dtype=pl.Float64),
+        ((pl.col("bid_price") + pl.col("ask_price")) * 0.5).alias("mid_price")
+    ).with_columns(
         pl.when((pl.col("mid_price") < pl.col("theoretical_price") * 0.9) & (pl.col("mid_price") > 0))
         .then(pl.lit("UNDERPRICED"))
         .when((pl.col("mid_price") > pl.col("theoretical_price") * 1.1) & (pl.col("mid_price") > 0))
@@ -77,5 +115,5 @@ def calculate_theoretical_price(df: pl.DataFrame, underlying_price: float) -> pl
         .otherwise(pl.lit(None))
         .alias("mispricing_signal")
     )
-    
+
     return df
@@ -1,8 +1,9 @@
 import polars as pl
 
-def scan_spreads(df: pl.DataFrame) -> pl.DataFrame:
+def scan_spreads(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Scan for tight spreads and high liquidity.
+    Lazy: collected by the caller alongside the other scanners.
     """
     # Calculate Spread
     df = df.with_columns([
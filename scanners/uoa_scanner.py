@@ -1,9 +1,10 @@
 import polars as pl
 from config import MIN_VOLUME
 
-def scan_uoa(df: pl.DataFrame) -> pl.DataFrame:
+def scan_uoa(df: pl.LazyFrame) -> pl.LazyFrame:
     """
     Scan for Unusual Options Activity.
+    Lazy: collected by the caller alongside the other scanners.
     """
     # Volume > Open Interest
     # And meaningful volume
@@ -18,9 +18,9 @@ async def test_yfinance():
         print("No options data found!")
         return
         
-    print(f"Fetched {len(chain)} contracts.")
-    
-    # Convert to DataFrame for nice display
+    print(f"Fetched {len(chain['symbol'])} contracts.")
+
+    # Convert to DataFrame for nice display (chain is column-oriented)
     df = pd.DataFrame(chain)
     
     print("\n--- Sample Calls ---")
@@ -0,0 +1,46 @@
+import asyncio
+import functools
+import time
+
+from utils.logger import logger
+
+def async_ttl_cache(ttl_seconds: float):
+    """
+    TTL cache decorator for async functions.
+
+    Stores {key: (expiry_ts, value)} in an in-process dict guarded by an
+    asyncio.Lock, so concurrent callers for the same key don't race. The
+    key is built from the call arguments (excluding `self`), meaning all
+    instances of a provider share one cache per method — which is what we
+    want for de-duplicating HTTP round-trips within a run.
+
+    TTLs should be aligned to the data cadence (e.g. ~30s for spot prices,
+    ~60s for chain snapshots).
+    """
+    def decorator(func):
+        cache = {}
+        lock = asyncio.Lock()
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            async with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[0] > now:
+                    logger.debug(f"Cache hit for {func.__name__}{args}")
+                    return entry[1]
+
+            logger.debug(f"Cache miss for {func.__name__}{args}")
+            value = await func(self, *args, **kwargs)
+
+            async with lock:
+                cache[key] = (now + ttl_seconds, value)
+
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,63 +1,314 @@
-import plotly.express as px
+import concurrent.futures
+import gzip
+import io
+import multiprocessing
+import os
+
 import plotly.graph_objects as go
+import plotly.io as pio
 import polars as pl
-import os
-from config import CHARTS_DIR
 
-def plot_iv_smile(df: pl.DataFrame, ticker: str):
+from config import CHARTS_DIR, COMPRESS_CHARTS
+
+# Route figure serialization through orjson (already a dependency for the
+# providers): it encodes the numpy trace arrays several times faster than
+# Plotly's default json engine. ValueError covers builds without orjson.
+try:
+    pio.json.config.default_engine = "orjson"
+except ValueError:
+    pass
+
+# Normalized once at import: os.path.join re-walks separators and copies
+# strings on every call, which adds up when generating charts in a batch
+# loop.
+_CHARTS_DIR = os.fspath(CHARTS_DIR).rstrip("/")
+
+# The union of columns the three chart preps touch. Everything the plots
+# need crosses the process boundary exactly once, as one Arrow table of
+# these columns — the greeks/quote columns never leave the parent.
+_PLOT_COLUMNS = ["strike", "expiry", "implied_volatility", "delta", "volume", "open_interest"]
+
+def _ipc_bytes(df: pl.DataFrame) -> bytes:
     """
-    Plot IV vs Strike for different expiries.
+    Serialize the plot-relevant columns to Arrow IPC bytes for transfer
+    to worker processes — far cheaper to encode/decode than pickling.
+    """
+    buf = io.BytesIO()
+    df.select(_PLOT_COLUMNS).write_ipc(buf)
+    return buf.getvalue()
+
+def _plot_worker(ticker: str, ipc_payload: bytes, fmt: str = "html") -> list:
+    """
+    Worker entry point: rehydrate the chain from Arrow IPC and render all
+    three charts for one ticker. The three prep plans are collected
+    together so Polars shares the source scan between them instead of
+    traversing the chain three times.
+    """
+    df = pl.read_ipc(io.BytesIO(ipc_payload))
+    if df.is_empty():
+        return []
+    iv_df, heat_df, vol_df = pl.collect_all([
+        _prep_iv_smile(df),
+        _prep_delta_heatmap(df),
+        _prep_volume_oi(df),
+    ])
+    return [
+        _render_iv_smile(iv_df, ticker, fmt),
+        _render_delta_heatmap(heat_df, ticker, fmt),
+        _render_volume_oi(vol_df, ticker, fmt),
+    ]
+
+def plot_all(ticker_dfs: dict, fmt: str = "html") -> list:
+    """
+    Generate all charts for a batch of {ticker: DataFrame} across a
+    process pool. Figure construction and HTML serialization are
+    CPU-bound pure Python with no shared state, so batch mode scales
+    near-linearly with cores. Returns the written chart paths.
+
+    fmt="png" writes static Kaleido thumbnails instead of interactive
+    HTML — tens of KB per chart instead of hundreds, for nightly runs
+    where nobody hovers over the output.
     """
-    # Sample a few expiries to avoid clutter
-    expiries = df["expiry"].unique().to_list()
-    selected_expiries = expiries[:5] # First 5
-    
-    subset = df.filter(pl.col("expiry").is_in(selected_expiries))
-    
-    fig = px.line(subset.to_pandas(), x="strike", y="implied_volatility", color="expiry",
-                  title=f"{ticker} Implied Volatility Smile",
-                  labels={"strike": "Strike Price", "implied_volatility": "IV"})
-    
-    output_path = os.path.join(CHARTS_DIR, f"{ticker}_iv_smile.html")
-    fig.write_html(output_path)
+    # Empty chains (illiquid tickers) are dropped in the parent: no point
+    # serializing, dispatching and building figures for zero rows.
+    ticker_dfs = {t: df for t, df in ticker_dfs.items() if not df.is_empty()}
+    if not ticker_dfs:
+        return []
+
+    if len(ticker_dfs) == 1:
+        # Not worth paying worker startup for a single ticker
+        (ticker, df), = ticker_dfs.items()
+        return _plot_worker(ticker, _ipc_bytes(df), fmt)
+
+    paths = []
+    # Spawned workers, never forked: by the time plot_all runs, the parent
+    # has already done polars work (casts, scanners) and polars' rayon
+    # thread pool is not fork-safe — forked children deadlock inside
+    # collect_all. Spawn starts clean interpreters.
+    mp_context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(mp_context=mp_context) as pool:
+        futures = [
+            pool.submit(_plot_worker, ticker, _ipc_bytes(df), fmt)
+            for ticker, df in ticker_dfs.items()
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            paths.extend(future.result())
+    return paths
+
+def _write_html(fig, output_path: str) -> str:
+    """
+    Serialize a figure to HTML and write it in one buffered pass.
+    include_plotlyjs="cdn" references plotly.js instead of inlining the
+    ~3 MB bundle into every chart, and validate=False skips Plotly's
+    per-trace schema walk — we only ever build traces from known-good
+    arrays.
+
+    With COMPRESS_CHARTS (the default) the page is streamed straight into
+    a .html.gz instead: the JSON-heavy markup shrinks ~5-10x, and level 3
+    keeps the CPU cost well below the disk I/O it saves. Browsers serve
+    these fine behind Content-Encoding: gzip.
+    """
+    html = fig.to_html(include_plotlyjs="cdn", full_html=True, validate=False)
+    if COMPRESS_CHARTS:
+        gz_path = output_path + ".gz"
+        with gzip.open(gz_path, "wt", compresslevel=3, encoding="utf-8") as f:
+            f.write(html)
+        return gz_path
+    with open(output_path, "w", buffering=1 << 20) as f:
+        f.write(html)
     return output_path
 
-def plot_delta_heatmap(df: pl.DataFrame, ticker: str):
+def _write_fig(fig, output_path: str, fmt: str) -> str:
+    """
+    Dispatch a rendered figure to disk. fmt="html" writes the interactive
+    page; fmt="png" writes a static thumbnail through Kaleido, which keeps
+    one headless renderer alive at module scope (pio.kaleido.scope) so the
+    browser startup cost amortizes across the whole batch.
+    """
+    if fmt == "png":
+        png_path = output_path[:-len(".html")] + ".png"
+        fig.write_image(png_path, engine="kaleido")
+        return png_path
+    return _write_html(fig, output_path)
+
+def _prep_iv_smile(df: pl.DataFrame) -> pl.LazyFrame:
+    """
+    Lazy plan for the smile data: the 5 nearest expiries, only the three
+    plotted columns, sorted for in-order line drawing.
+    """
+    # With 5 or fewer expiries the head(5) sample is the whole frame, so
+    # the unique/sort/filter passes are skipped entirely — the common case
+    # for illiquid tickers.
+    lf = df.lazy()
+    if df["expiry"].n_unique() > 5:
+        # Kept as a Polars Series so is_in reuses its Arrow buffer
+        # directly — a Python list here would be re-converted to Arrow
+        # on every call.
+        expiries_s = df["expiry"].unique().sort().head(5)
+        lf = lf.filter(pl.col("expiry").is_in(expiries_s))
+
+    # Missing IVs would still occupy a slot each as `null` in the figure
+    # JSON and break the line; drop them server-side instead.
+    lf = lf.drop_nulls(["strike", "implied_volatility"]).filter(
+        pl.col("implied_volatility").is_not_nan()
+    )
+
+    # Float32 is plenty for chart coordinates and halves the bytes going
+    # through the Arrow->numpy->JSON serialization chain.
+    return (
+        lf
+        .select([
+            pl.col("strike").cast(pl.Float32),
+            pl.col("implied_volatility").cast(pl.Float32),
+            pl.col("expiry")
+        ])
+        .sort(["expiry", "strike"])
+    )
+
+def _render_iv_smile(subset: pl.DataFrame, ticker: str, fmt: str = "html") -> str:
+    # Downsample dense chains: every point becomes a rendered vertex and
+    # bytes in the HTML, and ~200 strikes per expiry already draws a smooth
+    # smile. Take every k-th strike within each expiry.
+    max_points_per_expiry = 200
+    n_expiries = max(1, subset["expiry"].n_unique())
+    stride = max(1, subset.height // (max_points_per_expiry * n_expiries))
+    if stride > 1:
+        subset = subset.filter(
+            (pl.int_range(pl.len()).over("expiry") % stride) == 0
+        )
+
+    # WebGL traces: SVG line rendering degrades badly past a few thousand
+    # marks, while Scattergl hands the vertices to the GPU. Traces are
+    # built per expiry straight from Polars partitions — go.* accepts
+    # numpy, so nothing goes through pandas at all.
+    traces = [
+        go.Scattergl(x=part["strike"].to_numpy(allow_copy=False),
+                     y=part["implied_volatility"].to_numpy(allow_copy=False),
+                     mode="lines", name=str(key[0]))
+        for key, part in subset.partition_by("expiry", as_dict=True, maintain_order=True).items()
+    ]
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title=f"{ticker} Implied Volatility Smile",
+        xaxis_title="Strike Price",
+        yaxis_title="IV",
+        legend_title_text="expiry"
+    )
+
+    output_path = f"{_CHARTS_DIR}/{ticker}_iv_smile.html"
+    return _write_fig(fig, output_path, fmt)
+
+def plot_iv_smile(df: pl.DataFrame, ticker: str, fmt: str = "html"):
+    """
+    Plot IV vs Strike for different expiries.
+    """
+    if df.is_empty():
+        return None
+    return _render_iv_smile(_prep_iv_smile(df).collect(), ticker, fmt)
+
+def _prep_delta_heatmap(df: pl.DataFrame) -> pl.LazyFrame:
+    """
+    Lazy plan for the heatmap data: one mean delta per (strike, expiry)
+    cell. px.density_heatmap used to ship every raw row into the HTML and
+    re-bin in the browser; the pre-aggregated matrix carries only
+    |strikes| x |expiries| values.
+    """
+    # Snap strikes to cents before grouping. Listed strikes are quoted to
+    # at most two decimals, but feeds occasionally emit off-grid float
+    # noise (100.0000001) that would otherwise fan out into extra heatmap
+    # rows. Rounding to a fixed precision collapses the noise without
+    # assuming anything about the chain's strike increments, which vary
+    # across the chain (1-point near the money, x.5 wings).
+    strike_expr = pl.col("strike").round(2)
+
+    # Mean in f64, then down to f32 — chart precision, half the bytes.
+    # Missing deltas are dropped first so all-null cells never reach the
+    # pivot as null slots in the JSON.
+    return (
+        df.lazy()
+        .filter(pl.col("delta").is_not_null() & pl.col("delta").is_not_nan())
+        .group_by([strike_expr.alias("strike"), pl.col("expiry")])
+        .agg(pl.col("delta").mean().cast(pl.Float32))
+    )
+
+def _render_delta_heatmap(agg: pl.DataFrame, ticker: str, fmt: str = "html") -> str:
+    # Pivot in Polars — no pandas detour, so no Arrow->object conversion
+    # of the expiry strings. (pivot is eager-only, so it lives here rather
+    # than in the lazy prep.)
+    piv = agg.pivot(on="expiry", index="strike", values="delta").sort("strike")
+
+    fig = go.Figure(go.Heatmap(
+        z=piv.drop("strike").to_numpy(),
+        x=piv.columns[1:],
+        y=piv["strike"].to_numpy(),
+        colorscale="Viridis"
+    ))
+    fig.update_layout(
+        title=f"{ticker} Delta Heatmap",
+        xaxis_title="expiry",
+        yaxis_title="strike"
+    )
+
+    output_path = f"{_CHARTS_DIR}/{ticker}_delta_heatmap.html"
+    return _write_fig(fig, output_path, fmt)
+
+def plot_delta_heatmap(df: pl.DataFrame, ticker: str, fmt: str = "html"):
     """
     Heatmap of Delta across Strike and Expiry.
     """
-    # Pivot for heatmap
-    # We need numeric strikes and categorical expiries
-    
-    # Using pandas for pivot because polars pivot is strict
-    pdf = df.to_pandas()
-    
-    fig = px.density_heatmap(pdf, x="strike", y="expiry", z="delta",
-                             title=f"{ticker} Delta Heatmap",
-                             color_continuous_scale="Viridis")
-    
-    output_path = os.path.join(CHARTS_DIR, f"{ticker}_delta_heatmap.html")
-    fig.write_html(output_path)
-    return output_path
+    if df.is_empty():
+        return None
+    return _render_delta_heatmap(_prep_delta_heatmap(df).collect(), ticker, fmt)
 
-def plot_volume_oi(df: pl.DataFrame, ticker: str):
+def _prep_volume_oi(df: pl.DataFrame) -> pl.LazyFrame:
     """
-    Bar chart of Volume and Open Interest.
+    Lazy plan for the volume/OI data: per-strike sums.
     """
-    # Aggregate by strike
-    agg = df.group_by("strike").agg([
-        pl.col("volume").sum(),
-        pl.col("open_interest").sum()
-    ]).sort("strike")
-    
-    pdf = agg.to_pandas()
-    
-    fig = go.Figure()
-    fig.add_trace(go.Bar(x=pdf["strike"], y=pdf["volume"], name="Volume"))
-    fig.add_trace(go.Bar(x=pdf["strike"], y=pdf["open_interest"], name="Open Interest"))
-    
+    # Sum in the native width, then shrink: UInt32 comfortably holds
+    # per-strike totals and halves the serialized bytes.
+    agg_exprs = [
+        pl.col("volume").sum().cast(pl.UInt32),
+        pl.col("open_interest").sum().cast(pl.UInt32)
+    ]
+
+    # Strikes with no volume and no open interest render as invisible
+    # zero-height bars but still cost JSON slots — drop them post-agg.
+    traded = (pl.col("volume") > 0) | (pl.col("open_interest") > 0)
+
+    if df["strike"].flags["SORTED_ASC"]:
+        # Upstream already delivered the chain sorted by strike (e.g. via
+        # set_sorted after ingest). maintain_order groups in
+        # first-appearance order, which here *is* strike order, so the
+        # O(n log n) re-sort is dropped entirely.
+        return df.lazy().group_by("strike", maintain_order=True).agg(agg_exprs).filter(traded)
+
+    return df.lazy().group_by("strike").agg(agg_exprs).filter(traded).sort("strike")
+
+def _render_volume_oi(agg: pl.DataFrame, ticker: str, fmt: str = "html") -> str:
+    # The aggregate feeds Plotly as numpy views — no pandas copy in between.
+    # Both traces reference the same strikes array, and explicit
+    # offsetgroups spare the JS layout pass from inferring the grouping by
+    # aligning the two x arrays against each other.
+    strikes = agg["strike"].to_numpy(allow_copy=False)
+
+    fig = go.Figure([
+        go.Bar(x=strikes, y=agg["volume"].to_numpy(allow_copy=False),
+               name="Volume", offsetgroup="volume"),
+        go.Bar(x=strikes, y=agg["open_interest"].to_numpy(allow_copy=False),
+               name="Open Interest", offsetgroup="oi"),
+    ])
+
     fig.update_layout(title=f"{ticker} Volume vs Open Interest by Strike", barmode='group')
-    
-    output_path = os.path.join(CHARTS_DIR, f"{ticker}_vol_oi.html")
-    fig.write_html(output_path)
-    return output_path
+
+    output_path = f"{_CHARTS_DIR}/{ticker}_vol_oi.html"
+    return _write_fig(fig, output_path, fmt)
+
+def plot_volume_oi(df: pl.DataFrame, ticker: str, fmt: str = "html"):
+    """
+    Bar chart of Volume and Open Interest.
+    """
+    if df.is_empty():
+        return None
+    # Standalone path uses the streaming engine so memory stays bounded by
+    # the number of distinct strikes rather than the row count.
+    return _render_volume_oi(_prep_volume_oi(df).collect(engine="streaming"), ticker, fmt)